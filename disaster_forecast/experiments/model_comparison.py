@@ -137,8 +137,8 @@ def negbin_forecast(y_train, n_train, n_test, horizon):
     try:
         model = sm.GLM(
             y_train, _glm_features(0, n_train),
-            family=sm.families.NegativeBinomial(),
-        ).fit(maxiter=200, disp=False)
+            family=sm.families.NegativeBinomial(alpha=1.0),
+        ).fit(method="IRLS", maxiter=50, tol=1e-6, atol=1e-6, disp=False)
 
         test_pred = np.maximum(0.0, model.predict(_glm_features(n_train, n_test)))
 
@@ -15,12 +15,11 @@ Run from repo root:
     python disaster_forecast/negbin_model.py
 """
 
-import json
 import warnings
 
 import numpy as np
+import orjson
 import pandas as pd
-import statsmodels.api as sm
 from scipy import stats
 
 warnings.filterwarnings("ignore")
@@ -32,6 +31,9 @@ END_DATE         = "2026-02-01"
 FORECAST_HORIZON = 72   # months (6 years, through Feb 2032)
 N_TEST           = 12   # months held out for evaluation
 
+# Every combo shares the same monthly index, so build it once
+_DATE_RANGE = pd.date_range(start=START_DATE, end=END_DATE, freq="MS")
+
 MAJOR_DISASTERS = [
     "Hurricane", "Severe Storm", "Flood", "Fire",
     "Tornado", "Snowstorm", "Severe Ice Storm",
@@ -40,15 +42,16 @@ MAJOR_DISASTERS = [
 
 # ── Data helper ───────────────────────────────────────────────────────────────
 
-def create_complete_series(df_subset):
-    """Fill missing months with 0 — same logic as proper_timeseries_v2.py."""
-    date_range  = pd.date_range(start=START_DATE, end=END_DATE, freq="MS")
-    complete    = pd.DataFrame({"date": date_range})
-    complete    = complete.merge(
-        df_subset[["date", "disaster_count"]], on="date", how="left"
+def complete_counts(df_subset):
+    """
+    Fill missing months with 0 — same logic as proper_timeseries_v2.py, but
+    returns the counts over _DATE_RANGE as a bare int32 array.
+    """
+    return (
+        df_subset.set_index("date")["disaster_count"]
+        .reindex(_DATE_RANGE, fill_value=0)
+        .to_numpy(np.int32)
     )
-    complete["disaster_count"] = complete["disaster_count"].fillna(0).astype(int)
-    return complete
 
 
 # ── GLM feature matrix ────────────────────────────────────────────────────────
@@ -63,61 +66,144 @@ def build_features(start_idx: int, n: int) -> np.ndarray:
     t         = np.arange(start_idx, start_idx + n)
     month_idx = t % 12                          # 0=Jan, 1=Feb, ..., 11=Dec
 
-    X = np.zeros((n, 13))
-    X[:, 0] = 1                                 # intercept
-    X[:, 1] = t / 100.0                         # scaled trend
-    for m in range(1, 12):                      # Feb(1) … Dec(11)
-        X[:, m + 1] = (month_idx == m).astype(float)
+    X = np.empty((n, 13))
+    X[:, 0]  = 1.0                              # intercept
+    X[:, 1]  = t / 100.0                        # scaled trend
+    X[:, 2:] = np.eye(12)[month_idx, 1:]        # Feb(1) … Dec(11) in one gather
     return X
 
 
 # ── Model fitting ─────────────────────────────────────────────────────────────
 
-def fit_negbin(y_train, n_train, n_test, horizon):
+NB_ALPHA = 1.0   # fixed dispersion — same as sm.families.NegativeBinomial()
+
+
+def _negbin_deviance(Y, mu, alpha):
+    """Per-column NegBin deviance for (T, K) count and mean matrices."""
+    y_log_y = np.where(Y > 0, Y * np.log(np.where(Y > 0, Y, 1.0) / mu), 0.0)
+    dev = y_log_y - (Y + 1.0 / alpha) * np.log((1.0 + alpha * Y) / (1.0 + alpha * mu))
+    return 2.0 * dev.sum(axis=0)
+
+
+def batch_negbin_irls(Y, X, alpha=NB_ALPHA, maxiter=50, tol=1e-6):
     """
-    Fit a Negative Binomial GLM on y_train, then:
-      • Predict n_test steps for validation
-      • Forecast `horizon` steps into the future with 95% CI
+    Fit K log-link NegBin GLMs that share one design matrix, in lockstep.
 
-    Returns (test_pred, forecast, lower, upper, converged_flag).
-    Returns (None, None, None, None, False) on failure.
+    Y : (T, K) training counts, one column per combo
+    X : (T, p) shared feature matrix from build_features()
+
+    Same IRLS as statsmodels (starting mu, working weights, deviance
+    convergence), but every step is one batched einsum / pinv over all K
+    combos instead of K separate Python-level fits.
+
+    Returns (beta, cov): beta is (p, K), cov is (K, p, p).
     """
-    if y_train.sum() == 0:
-        # Can't fit NegBin on all-zero series
-        return None, None, None, None, False
-
-    try:
-        X_train = build_features(0, n_train)
-        model   = sm.GLM(
-            y_train,
-            X_train,
-            family=sm.families.NegativeBinomial(),
-        ).fit(maxiter=200, disp=False)
+    K    = Y.shape[1]
+    mu   = (Y + Y.mean(axis=0)) / 2.0
+    eta  = np.log(mu)
+    dev  = _negbin_deviance(Y, mu, alpha)
+    beta = np.zeros((X.shape[1], K))
+    cov  = np.zeros((K, X.shape[1], X.shape[1]))
+
+    # Columns stop updating once their own deviance has converged, exactly
+    # as each separate statsmodels fit would have stopped
+    active = np.ones(K, dtype=bool)
+
+    for _ in range(maxiter):
+        Ya, mua, etaa = Y[:, active], mu[:, active], eta[:, active]
+
+        W    = mua / (1.0 + alpha * mua)                    # working weights
+        z    = etaa + (Ya - mua) / mua                      # working response
+        XtWX = np.einsum("ti,tk,tj->kij", X, W, X)          # (k, p, p)
+        XtWz = np.einsum("ti,tk->ki", X, W * z)             # (k, p)
+
+        # A diverging column (mu over/underflow) would make the batched pinv
+        # raise for every combo — fail just that column, as its own fit would
+        idx = np.flatnonzero(active)
+        bad = ~(np.isfinite(XtWX).all(axis=(1, 2)) & np.isfinite(XtWz).all(axis=1))
+        if bad.any():
+            beta[:, idx[bad]] = np.nan
+            active[idx[bad]]  = False
+            if not active.any():
+                break
+            Ya, XtWX, XtWz = Ya[:, ~bad], XtWX[~bad], XtWz[~bad]
+            idx = idx[~bad]
+
+        cov_a  = np.linalg.pinv(XtWX)
+        beta_a = np.einsum("kij,kj->ik", cov_a, XtWz)       # (p, k)
+
+        eta_a   = X @ beta_a
+        mu_a    = np.exp(eta_a)
+        new_dev = _negbin_deviance(Ya, mu_a, alpha)
+
+        beta[:, idx], cov[idx] = beta_a, cov_a
+        eta[:, idx], mu[:, idx] = eta_a, mu_a
+
+        done = np.isclose(new_dev, dev[idx], rtol=0.0, atol=tol)
+        dev[idx] = new_dev
+        active[idx[done]] = False
+        if not active.any():
+            break
+
+    return beta, cov
+
+
+def fit_negbin(Y_train, X_train, X_test, X_fut):
+    """
+    Fit one Negative Binomial GLM per column of Y_train, then:
+      • Predict the X_test rows for validation
+      • Forecast the X_fut rows into the future with 95% CI
 
-        # ── Test predictions ──────────────────────────────────────────────
-        X_test    = build_features(n_train, n_test)
-        test_pred = np.maximum(0.0, model.predict(X_test))
+    The feature matrices come from build_features() and are shared by every
+    combo, since the series all cover the same fixed date range.
+
+    Returns (test_pred, forecast, lower, upper, converged) — the first four
+    are (rows, K) arrays and `converged` is a length-K bool mask. Columns
+    that failed (all-zero or non-finite predictions) are False in the mask.
+    """
+    K      = Y_train.shape[1]
+    n_test = X_test.shape[0]
+    n_fut  = X_fut.shape[0]
+
+    test_pred = np.full((n_test, K), np.nan)
+    forecast  = np.full((n_fut, K), np.nan)
+    lower     = np.full((n_fut, K), np.nan)
+    upper     = np.full((n_fut, K), np.nan)
 
-        # ── Future forecast with 95% CI ───────────────────────────────────
-        X_fut    = build_features(n_train + n_test, horizon)
-        pred_obj = model.get_prediction(X_fut)
-        ci       = pred_obj.summary_frame(alpha=0.05)
+    # Can't fit NegBin on all-zero series
+    fit_cols = np.flatnonzero(Y_train.sum(axis=0) > 0)
+    if len(fit_cols) == 0:
+        return test_pred, forecast, lower, upper, np.zeros(K, dtype=bool)
 
-        forecast = np.maximum(0.0, ci["mean"].values)
-        lower    = np.maximum(0.0, ci["mean_ci_lower"].values)
-        upper    = ci["mean_ci_upper"].values
+    with np.errstate(all="ignore"):
+        beta, cov = batch_negbin_irls(Y_train[:, fit_cols], X_train)
 
-        return test_pred, forecast, lower, upper, True
+        # ── Test predictions ──────────────────────────────────────────────
+        test_pred[:, fit_cols] = np.maximum(0.0, np.exp(X_test @ beta))
+
+        # ── Future forecast with 95% CI (delta method on the log scale) ───
+        eta_fut = X_fut @ beta
+        se_fut  = np.sqrt(np.einsum("ti,kij,tj->tk", X_fut, cov, X_fut))
+        z       = stats.norm.ppf(0.975)
 
-    except Exception:
-        return None, None, None, None, False
+        forecast[:, fit_cols] = np.maximum(0.0, np.exp(eta_fut))
+        lower[:, fit_cols]    = np.maximum(0.0, np.exp(eta_fut - z * se_fut))
+        upper[:, fit_cols]    = np.exp(eta_fut + z * se_fut)
+
+    # The upper bound may legitimately overflow to inf for months that never
+    # saw a declaration (quasi-separation), as it does under statsmodels
+    converged = np.isfinite(test_pred).all(axis=0) & np.isfinite(forecast).all(axis=0)
+    return test_pred, forecast, lower, upper, converged
 
 
 # ── Evaluation ────────────────────────────────────────────────────────────────
 
 def evaluate(y_true, y_pred):
-    mae  = round(float(np.mean(np.abs(y_true - y_pred))), 3)
-    rmse = round(float(np.sqrt(np.mean((y_true - y_pred) ** 2))), 3)
+    # Residuals computed once (int32 y_true promotes against the float
+    # predictions); RMSE uses a dot product rather than a squared temporary
+    resid = y_true - y_pred
+    mae   = round(float(np.abs(resid).mean()), 3)
+    rmse  = round(float(np.sqrt(resid @ resid / resid.size)), 3)
     return mae, rmse
 
 
@@ -141,71 +227,88 @@ def run_negbin(monthly_agg, state_stats):
     forecasts_data = {}
     performance    = []
 
-    for _, row in filtered.iterrows():
-        state    = row["state"]
-        disaster = row["incidentType"]
-        key      = f"{state}_{disaster.replace(' ', '_')}"
-
-        print(f"  [{key}]", end="  ")
-
-        subset = monthly_agg[
-            (monthly_agg["state"] == state)
-            & (monthly_agg["incidentType"] == disaster)
-        ]
-        ts    = create_complete_series(subset)
-        y     = ts["disaster_count"].values.astype(float)
-        dates = ts["date"].values
+    # Every series spans _DATE_RANGE, so the train length is the same for all
+    n_train = len(_DATE_RANGE) - N_TEST
+    if n_train < 24:
+        print("  ⚠  skipped all combos (< 24 train months)")
+        return forecasts_data, pd.DataFrame(performance)
+
+    # ...and so are the design matrices — build them once rather than three
+    # times per fit
+    X_train = build_features(0, n_train)
+    X_test  = build_features(n_train, N_TEST)
+    X_fut   = build_features(n_train + N_TEST, FORECAST_HORIZON)
+
+    # Index every (state, incidentType) group once instead of re-scanning
+    # the whole frame with a boolean mask for each combo
+    grouped = monthly_agg.groupby(["state", "incidentType"], sort=False, observed=True)
+
+    # ── Collect every combo's series, then fit them all in one batch ──────
+    combos = []
+    for state, disaster, total in zip(
+        filtered["state"].to_numpy(),
+        filtered["incidentType"].to_numpy(),
+        filtered["total_disasters"].to_numpy().astype(int),
+    ):
+        key = f"{state}_{disaster.replace(' ', '_')}"
+
+        try:
+            subset = grouped.get_group((state, disaster))
+        except KeyError:
+            print(f"  [{key}]  ⚠  skipped (no monthly records)")
+            continue
+        combos.append((state, disaster, key, int(total),
+                       complete_counts(subset)))
 
-        n_total = len(y)
-        n_train = n_total - N_TEST
+    if not combos:
+        return forecasts_data, pd.DataFrame(performance)
 
-        if n_train < 24:
-            print("⚠  skipped (< 24 train months)")
-            continue
+    Y = np.column_stack([c[4] for c in combos])          # (n_total, K)
+    test_pred, forecast, lower, upper, ok = fit_negbin(
+        Y[:n_train], X_train, X_test, X_fut
+    )
 
-        y_train = y[:n_train]
-        y_test  = y[n_train:]
+    future_dates = pd.date_range(
+        start=_DATE_RANGE[-1] + pd.DateOffset(months=1),
+        periods=FORECAST_HORIZON, freq="MS",
+    )
+    # Identical for every combo — format once, in C, and share the lists
+    hist_date_strs   = _DATE_RANGE.strftime("%Y-%m").tolist()
+    future_date_strs = future_dates.strftime("%Y-%m").tolist()
 
-        test_pred, forecast, lower, upper, ok = fit_negbin(
-            y_train, n_train, N_TEST, FORECAST_HORIZON
-        )
+    for k, (state, disaster, key, total, y) in enumerate(combos):
+        print(f"  [{key}]", end="  ")
 
-        if not ok:
+        if not ok[k]:
             print("⚠  GLM failed to converge")
             performance.append({
                 "state": state, "disaster_type": disaster,
-                "total_historical": int(row["total_disasters"]),
+                "total_historical": total,
                 "mae": None, "rmse": None, "converged": False,
             })
             continue
 
-        mae, rmse = evaluate(y_test, test_pred)
-
-        last_date    = pd.Timestamp(dates[-1])
-        future_dates = pd.date_range(
-            start=last_date + pd.DateOffset(months=1),
-            periods=FORECAST_HORIZON, freq="MS",
-        )
+        mae, rmse = evaluate(y[n_train:], test_pred[:, k])
 
         forecasts_data[key] = {
             "state":        state,
             "disaster_type": disaster,
             "historical": {
-                "dates":  [pd.Timestamp(d).strftime("%Y-%m") for d in dates],
-                "counts": y.tolist(),
+                "dates":  hist_date_strs,
+                "counts": y,
             },
             "forecast": {
-                "dates":            [d.strftime("%Y-%m") for d in future_dates],
-                "predicted_counts": [round(v, 2) for v in forecast.tolist()],
-                "lower_bound":      [round(v, 2) for v in lower.tolist()],
-                "upper_bound":      [round(v, 2) for v in upper.tolist()],
+                "dates":            future_date_strs,
+                "predicted_counts": np.round(forecast[:, k], 2),
+                "lower_bound":      np.round(lower[:, k], 2),
+                "upper_bound":      np.round(upper[:, k], 2),
             },
             "model_info": {"mae": mae, "rmse": rmse, "converged": True},
         }
 
         performance.append({
             "state": state, "disaster_type": disaster,
-            "total_historical": int(row["total_disasters"]),
+            "total_historical": total,
             "mae": mae, "rmse": rmse, "converged": True,
         })
 
@@ -220,8 +323,16 @@ def main():
     print("=" * 70)
 
     print("\n1. Loading data...")
-    monthly_agg = pd.read_csv("disaster_forecast/fema_monthly_aggregated.csv")
-    monthly_agg["date"] = pd.to_datetime(monthly_agg["date"])
+    monthly_agg = pd.read_csv(
+        "disaster_forecast/fema_monthly_aggregated.csv",
+        usecols=["date", "state", "incidentType", "disaster_count"],
+        dtype={
+            "state":          "category",
+            "incidentType":   "category",
+            "disaster_count": "int32",
+        },
+        parse_dates=["date"],
+    )
     state_stats = pd.read_csv("disaster_forecast/fema_state_incident_stats.csv")
     print(f"   ✓ {len(monthly_agg):,} monthly records")
     print(f"   ✓ {len(state_stats):,} state-incident combinations")
@@ -231,8 +342,11 @@ def main():
     forecasts_data, perf_df = run_negbin(monthly_agg, state_stats)
 
     print("\n3. Saving results...")
-    with open("disaster_forecast/negbin_forecasts.json", "w") as f:
-        json.dump(forecasts_data, f, indent=2)
+    with open("disaster_forecast/negbin_forecasts.json", "wb") as f:
+        f.write(orjson.dumps(
+            forecasts_data,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2,
+        ))
 
     perf_df.to_csv("disaster_forecast/negbin_performance.csv", index=False)
     print(f"   ✓ negbin_forecasts.json    ({len(forecasts_data)} models)")
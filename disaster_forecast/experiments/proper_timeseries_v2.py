@@ -6,10 +6,8 @@ Generate 72-month forecasts (through Feb 2032)
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import json
-from datetime import datetime
-from scipy import stats
+import orjson
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -19,8 +17,13 @@ print("="*80)
 
 # Load data
 print("\n1. LOADING AND PREPARING DATA...")
-df = pd.read_csv('/Users/alizasamad/Downloads/projects/datathon26/UCSB-Datathon-2026/data/fema_clean.csv')
-df['incidentBeginDate'] = pd.to_datetime(df['incidentBeginDate'])
+# Only the three columns used; state/incidentType as categoricals since they
+# are the repeated groupby keys (integer codes instead of string hashing)
+df = pd.read_csv('/Users/alizasamad/Downloads/projects/datathon26/UCSB-Datathon-2026/data/fema_clean.csv',
+                 usecols=['incidentBeginDate', 'state', 'incidentType'],
+                 dtype={'state': 'category', 'incidentType': 'category'},
+                 parse_dates=['incidentBeginDate'],
+                 date_format='%Y-%m-%d %H:%M:%S%z')
 df['year_month'] = df['incidentBeginDate'].dt.to_period('M')
 
 print(f"✓ Loaded {len(df):,} records")
@@ -39,33 +42,47 @@ print(f"✓ {len(all_states)} states/territories")
 
 print("\n2. CREATING COMPLETE MONTHLY TIME SERIES...")
 
-monthly_data = df.groupby(['state', 'incidentType', 'year_month']).size().reset_index(name='disaster_count')
+monthly_data = df.groupby(['state', 'incidentType', 'year_month'], observed=True).size().reset_index(name='disaster_count')
 monthly_data['date'] = monthly_data['year_month'].dt.to_timestamp()
 
 print(f"✓ Aggregated to {len(monthly_data):,} monthly records")
 
-def create_complete_series(df_subset, start_date, end_date):
-    """Fill missing months with 0 disasters"""
-    date_range = pd.date_range(start=start_date, end=end_date, freq='MS')
-    complete_df = pd.DataFrame({'date': date_range})
-    complete_df = complete_df.merge(df_subset[['date', 'disaster_count']], 
-                                    on='date', how='left')
-    complete_df['disaster_count'] = complete_df['disaster_count'].fillna(0).astype(int)
-    return complete_df
-
 start_date = '2000-01-01'
 end_date = '2026-02-01'
 
+# Dense (date × (state, disaster)) matrix with missing months filled as 0,
+# so each combo's complete series is a single column lookup
+wide = (monthly_data.pivot_table(index='date', columns=['state', 'incidentType'],
+                                 values='disaster_count', aggfunc='sum', fill_value=0,
+                                 observed=True)
+        .reindex(pd.date_range(start=start_date, end=end_date, freq='MS'), fill_value=0)
+        .astype(np.int32))
+dates = wide.index
+
 # ============================================================================
 # TIME SERIES FORECASTING FUNCTIONS
 # ============================================================================
 
+# All combos share the same series length (and the same train length), so
+# the time axis and its centred form are built once per length and reused
+_time_axes = {}
+
+def time_axis(n):
+    """(x, mean of x, centred x, sum of squared deviations, month index) for n months"""
+    if n not in _time_axes:
+        x = np.arange(n, dtype=np.float64)
+        x_dev = x - x.mean()
+        _time_axes[n] = (x, x.mean(), x_dev, (x_dev ** 2).sum(), np.arange(n) % 12)
+    return _time_axes[n]
+
 def calculate_trend(y):
-    """Calculate linear trend"""
-    x = np.arange(len(y))
+    """Calculate linear trend (least-squares slope and intercept)"""
     if len(y) < 3:
         return 0, 0
-    slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+    _, x_mean, x_dev, x_dev_sq_sum, _ = time_axis(len(y))
+    y_mean = y.mean()
+    slope = (x_dev * (y - y_mean)).sum() / x_dev_sq_sum
+    intercept = y_mean - slope * x_mean
     return slope, intercept
 
 def calculate_seasonality(y, period=12):
@@ -109,50 +126,41 @@ def exponential_smoothing_forecast(y, alpha=0.3, horizon=72):
     
     return np.array(forecast)
 
-def trend_seasonal_forecast(y, horizon=72):
-    """Forecast using trend + seasonality"""
+def fit_trend_seasonal(y):
+    """Fit trend + seasonality: (slope, intercept, seasonal_indices, baseline, std_error)"""
     if len(y) < 24:
-        # Not enough data, use simple average
+        # Not enough data — a flat simple average with no seasonality
         avg = np.mean(y) if len(y) > 0 else 0
-        return np.full(horizon, avg), 0, 0
+        return 0, avg, np.ones(12), avg, 0
     
     # Calculate components
     trend_slope, trend_intercept = calculate_trend(y)
     seasonal_indices = calculate_seasonality(y, period=12)
     
     # Detrend
-    x = np.arange(len(y))
+    x, _, _, _, month_idx = time_axis(len(y))
     trend_line = trend_slope * x + trend_intercept
     detrended = y - trend_line
     
     # Calculate baseline (mean of detrended data)
     baseline = np.mean(detrended)
     
-    # Generate forecast
-    forecast = []
-    current_x = len(y)
-    
-    for i in range(horizon):
-        # Trend component
-        trend_value = trend_slope * (current_x + i) + trend_intercept
-        
-        # Seasonal component
-        month_idx = (len(y) + i) % 12
-        seasonal_factor = seasonal_indices[month_idx]
-        
-        # Combine
-        if trend_value > 0:
-            pred = trend_value * seasonal_factor
-        else:
-            pred = baseline * seasonal_factor
-        
-        forecast.append(max(0, pred))
-    
     # Calculate uncertainty (std of residuals)
-    residuals = y - (trend_line + baseline * seasonal_indices[x % 12])
+    residuals = y - (trend_line + baseline * seasonal_indices[month_idx])
     std_error = np.std(residuals)
     
-    return np.array(forecast), std_error, trend_slope
+    return trend_slope, trend_intercept, seasonal_indices, baseline, std_error
+
+def predict_trend_seasonal(components, start, horizon):
+    """Forecast `horizon` months from month index `start` with fitted components"""
+    trend_slope, trend_intercept, seasonal_indices, baseline, _ = components
+    
+    # Trend (or baseline once the trend goes non-positive) scaled by the
+    # seasonal factor of each future month
+    future_x = start + np.arange(horizon)
+    trend_values = trend_slope * future_x + trend_intercept
+    level = np.where(trend_values > 0, trend_values, baseline)
+    return np.maximum(level * seasonal_indices[future_x % 12], 0)
 
 # ============================================================================
 # BUILD MODELS FOR STATE-DISASTER COMBINATIONS
@@ -164,43 +172,41 @@ print("="*80)
 forecasts_data = {}
 model_performance = []
 
-# Select combinations with sufficient data
-state_disaster_combos = []
-
-for disaster in major_disasters:
-    disaster_df = monthly_data[monthly_data['incidentType'] == disaster]
-    
-    for state in all_states:
-        state_disaster_df = disaster_df[disaster_df['state'] == state]
-        
-        if len(state_disaster_df) >= 12:  # At least 12 months
-            total_disasters = state_disaster_df['disaster_count'].sum()
-            if total_disasters >= 10:  # At least 10 total disasters
-                state_disaster_combos.append((state, disaster, total_disasters))
-
-# Sort by total disasters and take top 50
-state_disaster_combos.sort(key=lambda x: x[2], reverse=True)
-top_combos = state_disaster_combos[:50]
+# Select combinations with sufficient data: months with data and total
+# disasters per (state, disaster) in one groupby pass
+combo_stats = (monthly_data[monthly_data['incidentType'].isin(major_disasters)]
+               .groupby(['state', 'incidentType'], observed=True)['disaster_count']
+               .agg(['size', 'sum'])
+               .reset_index())
+combo_stats = combo_stats[(combo_stats['size'] >= 12)     # At least 12 months
+                          & (combo_stats['sum'] >= 10)]   # At least 10 total disasters
+
+# Sort by total disasters and take top 50 (ties keep major_disasters, then state, order)
+disaster_rank = {d: i for i, d in enumerate(major_disasters)}
+combo_stats = combo_stats.sort_values('incidentType',
+                                      key=lambda s: s.map(disaster_rank).astype(int),
+                                      kind='stable')
+combo_stats = combo_stats.sort_values('sum', ascending=False, kind='stable').head(50)
+top_combos = list(combo_stats[['state', 'incidentType', 'sum']].itertuples(index=False, name=None))
 
 print(f"\n✓ Selected {len(top_combos)} state-disaster combinations for forecasting")
 
 forecast_horizon = 72  # 6 years
 
+# Every combo covers the same months — format the date labels once
+hist_dates = dates.strftime('%Y-%m').tolist()
+future_dates = pd.date_range(start=dates[-1] + pd.DateOffset(months=1),
+                             periods=forecast_horizon, freq='MS').strftime('%Y-%m').tolist()
+
+# Progress lines are collected and written once after the loop
+log_lines = []
+
 for idx, (state, disaster, total) in enumerate(top_combos):
-    print(f"[{idx+1}/{len(top_combos)}] {state} - {disaster} ({total} disasters)")
+    log_lines.append(f"[{idx+1}/{len(top_combos)}] {state} - {disaster} ({total} disasters)")
     
     try:
-        # Get data
-        subset = monthly_data[
-            (monthly_data['state'] == state) & 
-            (monthly_data['incidentType'] == disaster)
-        ]
-        
-        # Create complete time series
-        ts_data = create_complete_series(subset, start_date, end_date)
-        
-        y = ts_data['disaster_count'].values
-        dates = ts_data['date'].values
+        # Get complete time series
+        y = wide[(state, disaster)].to_numpy()
         
         # Train/test split
         train_size = len(y) - 12
@@ -210,21 +216,15 @@ for idx, (state, disaster, total) in enumerate(top_combos):
         if len(train_data) < 12:
             continue
         
-        # Generate forecast
-        forecast, std_error, trend = trend_seasonal_forecast(train_data, horizon=forecast_horizon + 12)
-        
-        # Validate on test set
-        predictions_test = forecast[:12]
+        # Validate on test set — fit on train, predict only the 12 test months
+        predictions_test = predict_trend_seasonal(fit_trend_seasonal(train_data), train_size, 12)
         mae = np.mean(np.abs(test_data - predictions_test))
         rmse = np.sqrt(np.mean((test_data - predictions_test) ** 2))
         
         # Use full data for final forecast
-        forecast_full, std_error_full, trend_full = trend_seasonal_forecast(y, horizon=forecast_horizon)
-        
-        # Generate future dates
-        last_date = pd.Timestamp(dates[-1])
-        future_dates = pd.date_range(start=last_date + pd.DateOffset(months=1), 
-                                    periods=forecast_horizon, freq='MS')
+        full_fit = fit_trend_seasonal(y)
+        trend_full, _, _, _, std_error_full = full_fit
+        forecast_full = predict_trend_seasonal(full_fit, len(y), forecast_horizon)
         
         # Store results
         key = f"{state}_{disaster.replace(' ', '_')}"
@@ -232,11 +232,11 @@ for idx, (state, disaster, total) in enumerate(top_combos):
             'state': state,
             'disaster_type': disaster,
             'historical': {
-                'dates': [pd.Timestamp(d).strftime('%Y-%m') for d in dates],
+                'dates': hist_dates,
                 'counts': y.tolist()
             },
             'forecast': {
-                'dates': [pd.Timestamp(d).strftime('%Y-%m') for d in future_dates],
+                'dates': future_dates,
                 'predicted_counts': [round(v, 2) for v in forecast_full.tolist()],
                 'lower_bound': [max(0, round(v - 1.96 * std_error_full, 2)) for v in forecast_full.tolist()],
                 'upper_bound': [round(v + 1.96 * std_error_full, 2) for v in forecast_full.tolist()]
@@ -260,9 +260,10 @@ for idx, (state, disaster, total) in enumerate(top_combos):
         })
         
     except Exception as e:
-        print(f"  ⚠ Error: {str(e)[:80]}")
+        log_lines.append(f"  ⚠ Error: {str(e)[:80]}")
         continue
 
+print("\n".join(log_lines))
 print(f"\n✓ Successfully built {len(forecasts_data)} forecast models")
 
 # ============================================================================
@@ -273,45 +274,34 @@ print("\n4. CREATING US MAP SLIDER DATA FORMAT...")
 
 slider_data = {}
 
+def cells_by_date(frame, kind):
+    """{date: {state: {'count', 'type'}}} from a (dates × states) frame"""
+    states = frame.columns.tolist()
+    return {d: {s: {'count': c, 'type': kind} for s, c in zip(states, row)}
+            for d, row in zip(frame.index, frame.to_numpy().tolist())}
+
 for disaster in major_disasters:
     print(f"  Processing {disaster}...")
     
-    disaster_keys = [k for k in forecasts_data.keys() if disaster.replace(' ', '_') in k]
+    entries = [e for e in forecasts_data.values() if e['disaster_type'] == disaster]
     
-    if len(disaster_keys) == 0:
+    if len(entries) == 0:
         continue
     
-    # Collect all dates
-    all_dates_set = set()
-    for key in disaster_keys:
-        all_dates_set.update(forecasts_data[key]['historical']['dates'])
-        all_dates_set.update(forecasts_data[key]['forecast']['dates'])
-    
-    all_dates = sorted(list(all_dates_set))
+    # Every combo shares the same historical and forecast months, so each
+    # side is one (dates × states) frame
+    hist_wide = pd.DataFrame({e['state']: e['historical']['counts'] for e in entries},
+                             index=entries[0]['historical']['dates'])
+    fc_wide = pd.DataFrame({e['state']: e['forecast']['predicted_counts'] for e in entries},
+                           index=entries[0]['forecast']['dates'])
     
     # Structure: { date: { state: count } }
-    date_state_map = {}
-    
-    for date in all_dates:
-        date_state_map[date] = {}
-    
-    # Fill in data
-    for key in disaster_keys:
-        state = forecasts_data[key]['state']
-        
-        # Historical
-        for d, c in zip(forecasts_data[key]['historical']['dates'], 
-                       forecasts_data[key]['historical']['counts']):
-            date_state_map[d][state] = {'count': c, 'type': 'historical'}
-        
-        # Forecast
-        for d, c in zip(forecasts_data[key]['forecast']['dates'], 
-                       forecasts_data[key]['forecast']['predicted_counts']):
-            date_state_map[d][state] = {'count': c, 'type': 'forecast'}
+    date_state_map = {**cells_by_date(hist_wide, 'historical'),
+                      **cells_by_date(fc_wide, 'forecast')}
     
     slider_data[disaster] = {
         'disaster_type': disaster,
-        'dates': all_dates,
+        'dates': list(date_state_map),
         'data_by_date': date_state_map
     }
 
@@ -324,8 +314,9 @@ with open('disaster_forecast/ts_forecasts_proper.json', 'w') as f:
 performance_df = pd.DataFrame(model_performance)
 performance_df.to_csv('disaster_forecast/ts_model_performance.csv', index=False)
 
-with open('disaster_forecast/us_map_slider_data.json', 'w') as f:
-    json.dump(slider_data, f, indent=2)
+# Encoded in one pass and written in one call — slider_data is the largest output
+with open('disaster_forecast/us_map_slider_data.json', 'wb') as f:
+    f.write(orjson.dumps(slider_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
 
 print(f"✓ Saved full forecasts: ts_forecasts_proper.json ({len(forecasts_data)} models)")
 print(f"✓ Saved performance: ts_model_performance.csv")
@@ -10,8 +10,13 @@ Run from repo root:
 """
 
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
+import matplotlib
+matplotlib.use("Agg")   # non-interactive — no display required
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import numpy as np
@@ -55,12 +60,12 @@ def load_combo(data: dict, key: str):
     info  = entry.get("model_info", {})
 
     hist_df = pd.DataFrame({
-        "date":  pd.to_datetime([d + "-01" for d in entry["historical"]["dates"]]),
+        "date":  pd.to_datetime(entry["historical"]["dates"], format="%Y-%m"),
         "count": entry["historical"]["counts"],
     })
 
     fore_df = pd.DataFrame({
-        "date":      pd.to_datetime([d + "-01" for d in entry["forecast"]["dates"]]),
+        "date":      pd.to_datetime(entry["forecast"]["dates"], format="%Y-%m"),
         "predicted": entry["forecast"]["predicted_counts"],
         "lower":     entry["forecast"]["lower_bound"],
         "upper":     entry["forecast"]["upper_bound"],
@@ -100,10 +105,11 @@ def plot_combo(ax, hist_df: pd.DataFrame, fore_df: pd.DataFrame, meta: dict,
     )
 
     # ── 95% CI band ───────────────────────────────────────────────────────────
-    ax.fill_between(
+    ci_band = ax.fill_between(
         fore_df["date"], fore_df["lower"], fore_df["upper"],
         color=CI_COLOR, alpha=SHADE_ALPHA, label="95% CI", zorder=2,
     )
+    ci_band.set_rasterized(True)
 
     # ── Forecast boundary line ────────────────────────────────────────────────
     ax.axvline(forecast_start, color=BOUNDARY_CLR, linewidth=1.0,
@@ -156,19 +162,44 @@ def plot_combo(ax, hist_df: pd.DataFrame, fore_df: pd.DataFrame, meta: dict,
 
 # ── Full-size individual plot ─────────────────────────────────────────────────
 
-def save_individual_plot(key: str, hist_df, fore_df, meta, out_dir: Path):
-    fig, ax = plt.subplots(figsize=(13, 5))
-    plot_combo(ax, hist_df, fore_df, meta, compact=False)
+_INDIVIDUAL_FIG = None   # (fig, ax) — built lazily, once per worker process
+
+
+def make_individual_figure():
+    """
+    Build the 13×5 figure that individual plots are drawn into.
 
+    The layout is fixed up front so each save skips tight_layout and the
+    tight-bbox pass; save_individual_plot() just clears and redraws the axes.
+    """
+    fig, ax = plt.subplots(figsize=(13, 5))
+    fig.subplots_adjust(left=0.06, right=0.98, top=0.84, bottom=0.14)
     fig.suptitle(
-        f"FEMA Disaster Declaration Frequency — Prophet 72-Month Forecast",
-        fontsize=11, color="#444444", y=1.01,
+        "FEMA Disaster Declaration Frequency — Prophet 72-Month Forecast",
+        fontsize=11, color="#444444", y=0.97,
     )
-    fig.tight_layout()
-    out = out_dir / f"{key}.png"
-    fig.savefig(out, dpi=150, bbox_inches="tight")
-    plt.close(fig)
-    print(f"  ✓  {out.name}")
+    return fig, ax
+
+
+def save_individual_plot(key: str, entry: dict, out_dir: str) -> str:
+    """
+    Render one combo to <out_dir>/<key>.png and return the file name.
+
+    Top-level and fed only plain dicts/strings so it can run in a worker
+    process; each process reuses its own figure across the combos it gets.
+    """
+    global _INDIVIDUAL_FIG
+    if _INDIVIDUAL_FIG is None:
+        _INDIVIDUAL_FIG = make_individual_figure()
+    fig, ax = _INDIVIDUAL_FIG
+
+    hist_df, fore_df, meta = load_combo({key: entry}, key)
+    ax.clear()
+    plot_combo(ax, hist_df, fore_df, meta, compact=False)
+
+    out = Path(out_dir) / f"{key}.png"
+    fig.savefig(out, dpi=150, bbox_inches=None)
+    return out.name
 
 
 # ── 6-panel grid ─────────────────────────────────────────────────────────────
@@ -237,10 +268,17 @@ def main():
     save_grid_plot(available, data, out_dir)
 
     # ── 2. Individual full-size plots ─────────────────────────────────────────
+    # Each plot is independent and PNG encoding is CPU-bound, so render them
+    # in separate processes (pyplot state is not thread-safe)
     print("\nGenerating individual plots...")
-    for key in available:
-        hist_df, fore_df, meta = load_combo(data, key)
-        save_individual_plot(key, hist_df, fore_df, meta, out_dir)
+    n_workers = max(1, min(len(available), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=n_workers) as ex:
+        names = ex.map(
+            save_individual_plot,
+            available, [data[k] for k in available], repeat(str(out_dir)),
+        )
+        for name in names:
+            print(f"  ✓  {name}")
 
     print(f"\n✓ All plots saved to {out_dir}/")
     print(f"  Files: {[f.name for f in sorted(out_dir.glob('*.png'))]}")
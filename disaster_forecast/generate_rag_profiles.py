@@ -16,9 +16,10 @@ Run from repo root:
     python disaster_forecast/generate_rag_profiles.py
 """
 
-import json
 from pathlib import Path
 
+import numpy as np
+import orjson
 import pandas as pd
 
 # ── State code → full name ────────────────────────────────────────────────────
@@ -61,17 +62,14 @@ INDUSTRY_CONTEXT = {
     "Severe Ice Storm": "utilities, transportation, agriculture, and retail",
 }
 
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+MONTH_ORDER = {m: i for i, m in enumerate(MONTH_NAMES)}   # month name → 0-based position
 
-# ── Forecast analysis helpers ─────────────────────────────────────────────────
-
-def get_forecast_by_month(forecast: dict) -> dict[int, list[float]]:
-    """Group forecast predicted_counts by calendar month number."""
-    by_month: dict[int, list[float]] = {m: [] for m in range(1, 13)}
-    for date_str, val in zip(forecast["dates"], forecast["predicted_counts"]):
-        month = int(date_str.split("-")[1])
-        by_month[month].append(val)
-    return by_month
 
+# ── Forecast analysis helpers ─────────────────────────────────────────────────
 
 def get_season_description(peak_months: list[str]) -> str:
     """Turn a peak month list into a readable season description (sentence-ready)."""
@@ -87,14 +85,10 @@ def get_season_description(peak_months: list[str]) -> str:
 
 def get_risk_window(peak_months: list[str]) -> str:
     """Describe the high-risk window for workforce planning."""
-    month_order = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December",
-    ]
     months = [m.capitalize() for m in peak_months]
     if not months:
         return "year-round with no strong seasonal peak"
-    sorted_peaks = sorted(months, key=lambda m: month_order.index(m) if m in month_order else 99)
+    sorted_peaks = sorted(months, key=lambda m: MONTH_ORDER.get(m, 99))
     if len(sorted_peaks) == 1:
         return sorted_peaks[0]
     return f"{sorted_peaks[0]}–{sorted_peaks[-1]}"
@@ -102,6 +96,20 @@ def get_risk_window(peak_months: list[str]) -> str:
 
 # ── Narrative builder ─────────────────────────────────────────────────────────
 
+# Filled once per combo with str.format_map — see build_narrative for the fields
+NARRATIVE_TEMPLATE = """{state_name} {disaster_type} Seasonal Risk Profile
+
+{state_name} has recorded {total:,} FEMA {disaster_lc} declarations from 2000–2026 ({years_data} years of data). During active months, the state averages {avg_active:.1f} declarations per month. {season_desc}, with the highest-risk window being {risk_window}.
+
+6-Year Forecast {mae_note}:
+Our Prophet time series model projects {disaster_lc} declaration frequency in {state_name} through February 2032. During forecasted peak months ({peak_list}), the model predicts an average of {avg_peak:.1f} declarations/month. During off-season months, activity is expected to remain near {avg_off:.1f} declarations/month.
+
+Workforce Impact:
+Industries most affected by {disaster_lc} declarations in {state_name} include {industries}. Workers and employers in {state_name} should anticipate potential workforce disruption during {risk_window}. Disaster declaration frequency is seasonal — some years may see significantly more or fewer events depending on weather patterns.
+
+Important note: These forecasts predict FEMA declaration frequency (how often disasters are formally declared), not disaster probability or severity. A single major event can generate many county-level declarations in one month."""
+
+
 def build_narrative(state: str, disaster_type: str, entry: dict) -> str:
     """
     Build a self-contained, embeddable narrative text chunk for one combo.
@@ -126,37 +134,34 @@ def build_narrative(state: str, disaster_type: str, entry: dict) -> str:
     years_data   = round(train_months / 12, 0)
 
     # Forecast stats — split peak vs. off-season months
-    by_month     = get_forecast_by_month(forecast)
-    month_names  = [
-        "January","February","March","April","May","June",
-        "July","August","September","October","November","December"
-    ]
-    peak_idxs    = [month_names.index(m) + 1 for m in peak_months if m in month_names]
-    off_idxs     = [m for m in range(1, 13) if m not in peak_idxs]
+    peak_idxs    = [MONTH_ORDER[m] + 1 for m in peak_months if m in MONTH_ORDER]
 
-    peak_vals    = [v for idx in peak_idxs for v in by_month[idx]]
-    off_vals     = [v for idx in off_idxs  for v in by_month[idx]]
+    months       = np.fromiter((int(d[5:7]) for d in forecast["dates"]), dtype=np.int8)
+    vals         = np.asarray(forecast["predicted_counts"], dtype=np.float64)
+    peak_mask    = np.isin(months, np.array(peak_idxs, dtype=np.int8))
 
-    avg_peak     = round(sum(peak_vals) / len(peak_vals), 1) if peak_vals else 0
-    avg_off      = round(sum(off_vals)  / len(off_vals),  1) if off_vals  else 0
+    avg_peak     = round(float(vals[peak_mask].mean()),  1) if peak_mask.any()    else 0
+    avg_off      = round(float(vals[~peak_mask].mean()), 1) if not peak_mask.all() else 0
 
     season_desc  = get_season_description(peak_months)
     risk_window  = get_risk_window(peak_months)
     mae_note     = f"(model CV MAE={cv_mae:.2f})" if cv_mae is not None else ""
 
-    narrative = f"""{state_name} {disaster_type} Seasonal Risk Profile
-
-{state_name} has recorded {int(total):,} FEMA {disaster_type.lower()} declarations from 2000–2026 ({int(years_data)} years of data). During active months, the state averages {avg_active:.1f} declarations per month. {season_desc}, with the highest-risk window being {risk_window}.
-
-6-Year Forecast {mae_note}:
-Our Prophet time series model projects {disaster_type.lower()} declaration frequency in {state_name} through February 2032. During forecasted peak months ({', '.join(peak_months) if peak_months else 'N/A'}), the model predicts an average of {avg_peak:.1f} declarations/month. During off-season months, activity is expected to remain near {avg_off:.1f} declarations/month.
-
-Workforce Impact:
-Industries most affected by {disaster_type.lower()} declarations in {state_name} include {industries}. Workers and employers in {state_name} should anticipate potential workforce disruption during {risk_window}. Disaster declaration frequency is seasonal — some years may see significantly more or fewer events depending on weather patterns.
-
-Important note: These forecasts predict FEMA declaration frequency (how often disasters are formally declared), not disaster probability or severity. A single major event can generate many county-level declarations in one month."""
-
-    return narrative.strip()
+    return NARRATIVE_TEMPLATE.format_map({
+        "state_name":    state_name,
+        "disaster_type": disaster_type,
+        "disaster_lc":   disaster_type.lower(),
+        "total":         int(total),
+        "years_data":    int(years_data),
+        "avg_active":    avg_active,
+        "season_desc":   season_desc,
+        "risk_window":   risk_window,
+        "mae_note":      mae_note,
+        "peak_list":     ", ".join(peak_months) or "N/A",
+        "avg_peak":      avg_peak,
+        "avg_off":       avg_off,
+        "industries":    industries,
+    })
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
@@ -174,8 +179,7 @@ def main():
         print("Run: python disaster_forecast/prophet_forecast.py")
         return
 
-    with open(forecast_path) as f:
-        data = json.load(f)
+    data = orjson.loads(forecast_path.read_bytes())
 
     print(f"\nProcessing {len(data)} forecast combos...")
     print("-" * 60)
@@ -200,8 +204,7 @@ def main():
 
     # Save
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w") as f:
-        json.dump(profiles, f, indent=2)
+    out_path.write_bytes(orjson.dumps(profiles, option=orjson.OPT_INDENT_2))
 
     print(f"\n{'=' * 60}")
     print(f"✓  {len(profiles)} profiles written → {out_path}")
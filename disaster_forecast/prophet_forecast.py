@@ -26,16 +26,30 @@ Run from repo root:
     python disaster_forecast/prophet_forecast.py
 """
 
-import json
+import calendar
 import logging
+import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
+import orjson
 import pandas as pd
 
 warnings.filterwarnings("ignore")
 logging.getLogger("prophet").setLevel(logging.WARNING)
-logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+# cmdstanpy resets its logger to DEBUG (with an INFO console handler) unless one
+# is already attached, so attach our own WARNING-level handler: the per-chain
+# "start/done processing" lines stay quiet here and in worker processes, while
+# warnings/errors about a failed fit still reach stderr.
+_cmdstanpy_handler = logging.StreamHandler()
+_cmdstanpy_handler.setLevel(logging.WARNING)
+_cmdstanpy_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s", "%H:%M:%S")
+)
+_cmdstanpy_log = logging.getLogger("cmdstanpy")
+_cmdstanpy_log.addHandler(_cmdstanpy_handler)
+_cmdstanpy_log.setLevel(logging.WARNING)
 
 from prophet import Prophet
 
@@ -46,6 +60,19 @@ END_DATE         = "2026-02-01"
 FORECAST_HORIZON = 72   # months (~6 years, through Feb 2032)
 N_CV             = 12   # months held out for cross-validation accuracy estimate
 
+# Every combo shares the same monthly index, so build it once
+_DATE_RANGE = pd.date_range(start=START_DATE, end=END_DATE, freq="MS")
+
+# Month labels are identical for every combo — format them once
+_HIST_DATE_STRS   = _DATE_RANGE.strftime("%Y-%m").tolist()
+_FUTURE_DATE_STRS = pd.date_range(
+    start=_DATE_RANGE[-1] + pd.DateOffset(months=1),
+    periods=FORECAST_HORIZON,
+    freq="MS",
+).strftime("%Y-%m").tolist()
+
+MONTH_NAMES = list(calendar.month_name)[1:]   # "January" … "December"
+
 
 # ── Data helpers ──────────────────────────────────────────────────────────────
 
@@ -54,13 +81,12 @@ def create_complete_series(df_subset: pd.DataFrame) -> pd.DataFrame:
     Fill missing months with 0 so Prophet sees a contiguous monthly series.
     Months with no FEMA declaration get count=0.
     """
-    date_range = pd.date_range(start=START_DATE, end=END_DATE, freq="MS")
-    complete = pd.DataFrame({"date": date_range})
-    complete = complete.merge(
-        df_subset[["date", "disaster_count"]], on="date", how="left"
+    complete = (
+        df_subset.set_index("date")["disaster_count"]
+        .reindex(_DATE_RANGE, fill_value=0)
+        .astype(np.int32)
     )
-    complete["disaster_count"] = complete["disaster_count"].fillna(0).astype(int)
-    return complete
+    return complete.rename_axis("date").reset_index(name="disaster_count")
 
 
 def make_prophet_df(ts_df: pd.DataFrame) -> pd.DataFrame:
@@ -74,7 +100,7 @@ def make_prophet_df(ts_df: pd.DataFrame) -> pd.DataFrame:
 
 # ── Model ─────────────────────────────────────────────────────────────────────
 
-def build_prophet() -> Prophet:
+def build_prophet(uncertainty_samples: int = 100) -> Prophet:
     """
     Shared Prophet configuration used for both CV and final model.
 
@@ -84,6 +110,9 @@ def build_prophet() -> Prophet:
     changepoint_prior_scale   moderate flexibility: adapts to long-run trend shifts
                               without over-fitting short-term noise
     interval_width=0.95       95% uncertainty bands on the forecast
+    uncertainty_samples       Monte Carlo draws behind those bands — the main
+                              predict() cost; 100 (vs default 1000) is plenty
+                              for the summarised bands, 0 skips them entirely
     """
     return Prophet(
         yearly_seasonality=True,
@@ -92,6 +121,7 @@ def build_prophet() -> Prophet:
         seasonality_mode="additive",
         changepoint_prior_scale=0.05,
         interval_width=0.95,
+        uncertainty_samples=uncertainty_samples,
     )
     # TODO_CLIMATE: m.add_regressor("enso_index")
     # TODO_CLIMATE: m.add_regressor("global_temp_anomaly")
@@ -122,27 +152,28 @@ def fit_and_forecast(ts_df: pd.DataFrame, horizon: int = FORECAST_HORIZON, n_cv:
         n_train_cv = n_total - n_cv
         cv_train   = full_df.iloc[:n_train_cv]
 
-        m_cv = build_prophet()
+        m_cv = build_prophet(uncertainty_samples=0)   # CV only scores yhat
         m_cv.fit(cv_train)
 
-        cv_future   = m_cv.make_future_dataframe(periods=n_cv, freq="MS")
+        # Only the held-out months are scored, so skip predicting the history
+        cv_future   = m_cv.make_future_dataframe(periods=n_cv, freq="MS", include_history=False)
         cv_forecast = m_cv.predict(cv_future)
 
-        cv_pred = cv_forecast.iloc[n_train_cv:]["yhat"].clip(lower=0).values
-        cv_true = full_df.iloc[n_train_cv:]["y"].values
+        cv_pred = np.maximum(cv_forecast["yhat"].to_numpy(), 0)
+        cv_true = full_df["y"].to_numpy()[n_train_cv:]
 
-        cv_mae  = round(float(np.mean(np.abs(cv_true - cv_pred))), 3)
-        cv_rmse = round(float(np.sqrt(np.mean((cv_true - cv_pred) ** 2))), 3)
+        # One residual array for both metrics; RMSE via a dot product
+        resid   = cv_true - cv_pred
+        cv_mae  = round(float(np.abs(resid).mean()), 3)
+        cv_rmse = round(float(np.sqrt(resid @ resid / resid.size)), 3)
 
         # ── Final model on full history ───────────────────────────────────────
         m = build_prophet()
         m.fit(full_df)
 
-        future   = m.make_future_dataframe(periods=horizon, freq="MS")
-        forecast = m.predict(future)
-
-        # Future rows start at index n_total (rows 0..n_total-1 are historical)
-        fut_rows = forecast.iloc[n_total:].reset_index(drop=True)
+        # Future months only — historical fitted values are never used
+        future   = m.make_future_dataframe(periods=horizon, freq="MS", include_history=False)
+        fut_rows = m.predict(future)
 
         return fut_rows, cv_mae, cv_rmse, True
 
@@ -153,18 +184,69 @@ def fit_and_forecast(ts_df: pd.DataFrame, horizon: int = FORECAST_HORIZON, n_cv:
 # ── Evaluation helpers ────────────────────────────────────────────────────────
 
 def peak_months(ts_df: pd.DataFrame, top_n: int = 3) -> list[str]:
-    """Return month names with highest average disaster count."""
-    month_avg = (
-        ts_df.assign(month=ts_df["date"].dt.month)
-        .groupby("month")["disaster_count"]
-        .mean()
-        .sort_values(ascending=False)
-    )
-    month_names = [
-        pd.Timestamp(2000, int(m), 1).strftime("%B")
-        for m in month_avg.head(top_n).index
-    ]
-    return month_names
+    """Return month names with highest average disaster count (ties in calendar order)."""
+    month_idx = ts_df["date"].dt.month.to_numpy() - 1
+    sums      = np.bincount(month_idx, weights=ts_df["disaster_count"].to_numpy(), minlength=12)
+    counts    = np.bincount(month_idx, minlength=12)
+    month_avg = np.divide(sums, counts, out=np.zeros(12), where=counts > 0)
+    return [MONTH_NAMES[i] for i in np.argsort(-month_avg, kind="stable")[:top_n]]
+
+
+# ── Per-combo worker ──────────────────────────────────────────────────────────
+
+def process_combo(task):
+    """
+    Worker entry point: fit + forecast one combo and build its output records.
+
+    task = (state, disaster, total_disasters, ts) where ts is the complete
+    monthly series from create_complete_series().
+
+    Returns (forecast_entry, perf_row), or (None, None) if Prophet failed.
+    """
+    state, disaster, total, ts = task
+    y = ts["disaster_count"].values.astype(float)
+
+    # Fit + forecast
+    fut_rows, cv_mae, cv_rmse, ok = fit_and_forecast(ts)
+
+    if not ok:
+        return None, None
+
+    # Seasonal context: which months historically peak?
+    peaks = peak_months(ts)
+
+    entry = {
+        "state":         state,
+        "disaster_type": disaster,
+        "historical": {
+            "dates":  _HIST_DATE_STRS,
+            "counts": y.tolist(),
+        },
+        "forecast": {
+            "dates":            _FUTURE_DATE_STRS,
+            "predicted_counts": np.round(np.maximum(fut_rows["yhat"].to_numpy(), 0), 2),
+            "lower_bound":      np.round(np.maximum(fut_rows["yhat_lower"].to_numpy(), 0), 2),
+            "upper_bound":      np.round(fut_rows["yhat_upper"].to_numpy(), 2),
+        },
+        "model_info": {
+            "cv_mae":           cv_mae,
+            "cv_rmse":          cv_rmse,
+            "train_months":     int(len(ts)),
+            "forecast_horizon": FORECAST_HORIZON,
+            "peak_months":      peaks,
+            "total_historical": total,
+        },
+    }
+
+    perf_row = {
+        "state":            state,
+        "disaster_type":    disaster,
+        "total_historical": total,
+        "cv_mae":           cv_mae,
+        "cv_rmse":          cv_rmse,
+        "peak_months":      ", ".join(peaks),
+    }
+    return entry, perf_row
 
 
 # ── Main ──────────────────────────────────────────────────────────────────────
@@ -175,8 +257,16 @@ def main():
     print("=" * 70)
 
     # ── Load inputs ───────────────────────────────────────────────────────────
-    monthly_agg = pd.read_csv("disaster_forecast/fema_monthly_aggregated.csv")
-    monthly_agg["date"] = pd.to_datetime(monthly_agg["date"])
+    monthly_agg = pd.read_csv(
+        "disaster_forecast/fema_monthly_aggregated.csv",
+        usecols=["date", "state", "incidentType", "disaster_count"],
+        dtype={
+            "state":          "category",
+            "incidentType":   "category",
+            "disaster_count": "int32",
+        },
+        parse_dates=["date"],
+    )
 
     selected = pd.read_csv("disaster_forecast/selected_combos.csv")
 
@@ -190,80 +280,51 @@ def main():
     perf_rows  = []
     failed     = []
 
-    for _, row in selected.iterrows():
-        state    = row["state"]
-        disaster = row["incidentType"]
-        key      = f"{state}_{disaster.replace(' ', '_')}"
+    # Split the rows by combo in one groupby pass and build every complete
+    # series up front (a combo with no rows gets an empty, all-zero series →
+    # skipped); the independent Prophet fits then run in worker processes
+    groups = dict(tuple(
+        monthly_agg.groupby(["state", "incidentType"], sort=False, observed=True)
+    ))
+    no_rows = monthly_agg.iloc[:0]
 
-        print(f"  [{key}]", end="  ")
+    tasks = []
+    for row in selected.itertuples(index=False):
+        state    = row.state
+        disaster = row.incidentType
 
         # Build complete monthly series for this combo
-        subset = monthly_agg[
-            (monthly_agg["state"] == state) &
-            (monthly_agg["incidentType"] == disaster)
-        ]
-        ts    = create_complete_series(subset)
-        y     = ts["disaster_count"].values.astype(float)
-        dates = ts["date"].values
-
-        # Fit + forecast
-        fut_rows, cv_mae, cv_rmse, ok = fit_and_forecast(ts)
-
-        if not ok:
-            print("⚠  Prophet failed — skipped")
-            failed.append(key)
-            continue
-
-        # Future date index
-        last_date    = pd.Timestamp(dates[-1])
-        future_dates = pd.date_range(
-            start=last_date + pd.DateOffset(months=1),
-            periods=FORECAST_HORIZON,
-            freq="MS",
-        )
-
-        # Seasonal context: which months historically peak?
-        peaks = peak_months(ts)
-
-        forecasts[key] = {
-            "state":         state,
-            "disaster_type": disaster,
-            "historical": {
-                "dates":  [pd.Timestamp(d).strftime("%Y-%m") for d in dates],
-                "counts": y.tolist(),
-            },
-            "forecast": {
-                "dates":            [d.strftime("%Y-%m") for d in future_dates],
-                "predicted_counts": [round(v, 2) for v in fut_rows["yhat"].clip(lower=0).tolist()],
-                "lower_bound":      [round(v, 2) for v in fut_rows["yhat_lower"].clip(lower=0).tolist()],
-                "upper_bound":      [round(v, 2) for v in fut_rows["yhat_upper"].tolist()],
-            },
-            "model_info": {
-                "cv_mae":           cv_mae,
-                "cv_rmse":          cv_rmse,
-                "train_months":     int(len(ts)),
-                "forecast_horizon": FORECAST_HORIZON,
-                "peak_months":      peaks,
-                "total_historical": int(row["total_disasters"]),
-            },
-        }
-
-        perf_rows.append({
-            "state":            state,
-            "disaster_type":    disaster,
-            "total_historical": int(row["total_disasters"]),
-            "cv_mae":           cv_mae,
-            "cv_rmse":          cv_rmse,
-            "peak_months":      ", ".join(peaks),
-        })
+        subset = groups.get((state, disaster), no_rows)
+        tasks.append((state, disaster, int(row.total_disasters), create_complete_series(subset)))
+
+    # At least one worker: an empty selection still writes empty outputs
+    n_workers = max(1, min(len(tasks), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=n_workers) as ex:
+        results = ex.map(process_combo, tasks)
+
+        for (state, disaster, _, _), (entry, perf_row) in zip(tasks, results):
+            key = f"{state}_{disaster.replace(' ', '_')}"
+            print(f"  [{key}]", end="  ")
+
+            if entry is None:
+                print("⚠  Prophet failed — skipped")
+                failed.append(key)
+                continue
+
+            forecasts[key] = entry
+            perf_rows.append(perf_row)
 
-        print(f"CV MAE={cv_mae:.3f}   CV RMSE={cv_rmse:.3f}   peaks: {', '.join(peaks)}")
+            peaks = entry["model_info"]["peak_months"]
+            print(f"CV MAE={perf_row['cv_mae']:.3f}   CV RMSE={perf_row['cv_rmse']:.3f}   peaks: {', '.join(peaks)}")
 
     # ── Save outputs ──────────────────────────────────────────────────────────
     print("\n" + "=" * 70)
 
-    with open("disaster_forecast/prophet_state_forecasts.json", "w") as f:
-        json.dump(forecasts, f, indent=2)
+    with open("disaster_forecast/prophet_state_forecasts.json", "wb") as f:
+        f.write(orjson.dumps(
+            forecasts,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2,
+        ))
 
     perf_df = pd.DataFrame(perf_rows)
     perf_df.to_csv("disaster_forecast/prophet_forecast_performance.csv", index=False)
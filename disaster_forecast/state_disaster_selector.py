@@ -40,19 +40,18 @@ def select_top_combos(stats_df: pd.DataFrame) -> pd.DataFrame:
         (stats_df["months_with_data"] >= MIN_MONTHS)
     ].copy()
 
-    # Rank within each state by total declaration count
-    eligible["state_rank"] = (
-        eligible.groupby("state")["total_disasters"]
-        .rank(ascending=False, method="first")
-        .astype(int)
+    # Order by state, then by declaration count (desc). Stable sorts keep the
+    # original row order on ties, matching rank(method="first").
+    eligible = (
+        eligible.sort_values("total_disasters", ascending=False, kind="stable")
+        .sort_values("state", kind="stable")
     )
 
-    selected = (
-        eligible[eligible["state_rank"] <= TOP_N]
-        .sort_values(["state", "state_rank"])
-        .reset_index(drop=True)
-    )
-    return selected
+    # Already in rank order, so the top N per state are just the first N rows
+    selected = eligible.groupby("state", sort=False, observed=True).head(TOP_N).copy()
+    selected["state_rank"] = selected.groupby("state", sort=False, observed=True).cumcount() + 1
+
+    return selected.reset_index(drop=True)
 
 
 # ── Summary helpers ───────────────────────────────────────────────────────────
@@ -61,7 +60,7 @@ def print_state_summary(selected: pd.DataFrame) -> None:
     """Print one line per state showing selected disaster types."""
     print(f"\n{'STATE':<6}  {'SELECTED DISASTER TYPES (total declarations)'}")
     print("-" * 70)
-    for state, grp in selected.groupby("state"):
+    for state, grp in selected.groupby("state", observed=True):
         parts = [
             f"{row['incidentType']} ({int(row['total_disasters'])})"
             for _, row in grp.iterrows()
@@ -72,7 +71,7 @@ def print_state_summary(selected: pd.DataFrame) -> None:
 def print_disaster_coverage(selected: pd.DataFrame) -> None:
     """Show how many states each disaster type appears in."""
     coverage = (
-        selected.groupby("incidentType")["state"]
+        selected.groupby("incidentType", observed=True)["state"]
         .count()
         .sort_values(ascending=False)
         .rename("states_count")
@@ -92,6 +91,9 @@ def main():
 
     # ── 1. Load pre-built stats (produced by original EDA script) ─────────────
     stats = pd.read_csv("disaster_forecast/fema_state_incident_stats.csv")
+    # Categorical keys: every groupby below hashes small integer codes, not strings
+    stats["state"]        = stats["state"].astype("category")
+    stats["incidentType"] = stats["incidentType"].astype("category")
     print(f"\n  Loaded {len(stats):,} state-incident combinations")
     print(f"  Covering {stats['state'].nunique()} states")
     print(f"  Date range covered: 2000-01 → 2026-02\n")
@@ -99,7 +101,7 @@ def main():
     # ── 2. Overall disaster-type breakdown ────────────────────────────────────
     print("Top 10 disaster types by total declarations (all states combined):")
     top_types = (
-        stats.groupby("incidentType")["total_disasters"]
+        stats.groupby("incidentType", observed=True)["total_disasters"]
         .sum()
         .sort_values(ascending=False)
         .head(10)
@@ -112,7 +114,7 @@ def main():
     # ── 3. Per-state top-1 disaster overview ──────────────────────────────────
     top1 = (
         stats.sort_values("total_disasters", ascending=False)
-        .groupby("state")
+        .groupby("state", observed=True)
         .first()
         .reset_index()[["state", "incidentType", "total_disasters"]]
     )